@@ -10,6 +10,7 @@ Version: 2023-03-10
 from collections import defaultdict
 from dataclasses import dataclass
 from enum import Enum, auto
+from typing import Callable, Union
 
 from antlr4 import ParserRuleContext
 
@@ -46,18 +47,32 @@ class Category(Enum):
 class Entry:
     """
     A record of a semantic error, to be stored in the error log. Includes the parse tree
-    node on which the error was detected, the ErrorCategory, and a useful descriptive message.
+    node on which the error was detected, the ErrorCategory, and a useful descriptive
+    message. The message may also be deferred, as either a zero-argument callable
+    producing the message string or a (template, args) pair to be %-formatted, so
+    formatting work (e.g. getText() on a large subtree, or enum __str__ dispatch) is
+    only paid when the entry is actually displayed.
     """
     ctx: ParserRuleContext
     category: Category
-    message: str
+    message: Union[str, Callable[[], str], tuple]
 
     def line(self) -> int:
         """The source code line on which the semantic error was detected."""
         return self.ctx.start.line
 
+    def rendered_message(self) -> str:
+        """The descriptive message, rendering (and caching) a deferred message."""
+        message = self.message
+        if callable(message):
+            message = message()
+        elif isinstance(message, tuple):
+            message = message[0] % message[1]
+        self.message = message
+        return message
+
     def __repr__(self):
-        return f'line {self.line()} : {self.category} : {self.message}\n    {self.ctx.getText()}'
+        return f'line {self.line()} : {self.category} : {self.rendered_message()}\n    {self.ctx.getText()}'
 
 
 class ErrorLog:
@@ -69,7 +84,14 @@ class ErrorLog:
     def __init__(self):
         self.__entries = defaultdict(dict)
 
-    def add(self, ctx: ParserRuleContext, category: Category, message: str):
+    def add(self, ctx: ParserRuleContext, category: Category,
+            message: Union[str, Callable[[], str]], *args):
+        """
+        Records an error. `message` may be a ready string, a zero-argument
+        callable, or a %-template rendered with `args` on display.
+        """
+        if args:
+            message = (message, args)
         entry = Entry(ctx, category, message)
         self.__entries[entry.line()][ctx.getText()] = entry
 
@@ -7,7 +7,7 @@ The analysis has two major tasks:
 
 - to infer the types of all expressions in a Nimble program and to add appropriate type
 annotations to the program's ANTLR-generated syntax tree by storing an entry in the `node_types`
-dictionary for each expression node, where the key is the node and the value is a
+store (see `NodeTypes`) for each expression node, where the key is the node and the value is a
 `symboltable.PrimitiveType` or `symboltable.FunctionType`.
 
 - to identify and flag all violations of the Nimble semantic specification
@@ -30,10 +30,14 @@ phase or the second phase.
 In the second phase, type inference is performed and all other semantic constraints are
 checked.
 
+`CombinedSemanticsListener` runs both phases in a single tree walk - only a function's
+symbol and scope need to exist before its body is visited, which its enter methods
+take care of.
+
 
 NOTES:
     - Turns out there's an easy way to access the PrimitiveTypes values with a TYPE's text:
-        PrimitiveType['Int'] => PrimitiveType.Int. Thanks G-dawg.
+        PrimitiveType['Int'] => _INT. Thanks G-dawg.
 
 
 
@@ -44,23 +48,104 @@ Version:    March 2nd, 2023
 
 # --- Importing other Modules ---
 
+from collections import deque
+
+from antlr4 import ParserRuleContext
 from errorlog import ErrorLog, Category
 from nimble import NimbleListener, NimbleParser
 from symboltable import PrimitiveType, FunctionType, Scope
 
+# Name -> member lookup table for PrimitiveType. Indexing the enum class itself
+# (PrimitiveType[text]) goes through EnumMeta.__getitem__ on every TYPE token;
+# indexing the member map directly skips that. A plain dict copy is used
+# rather than the __members__ mappingproxy, since proxy indexing adds a
+# forwarding hop.
+_PRIM = dict(PrimitiveType.__members__)
+
+# Pre-bound PrimitiveType members. A reference like PrimitiveType.Int costs a
+# LOAD_GLOBAL plus a LOAD_ATTR per use; these module-level bindings collapse
+# that to a single LOAD_GLOBAL at the ~40 sites in the listeners below.
+_INT = PrimitiveType.Int
+_BOOL = PrimitiveType.Bool
+_STR = PrimitiveType.String
+_VOID = PrimitiveType.Void
+_ERR = PrimitiveType.ERROR
+
+# Dense result tables over Nimble's closed five-member type lattice, built
+# once at import. The operator exit methods reduce to a single dict lookup;
+# every invalid operand combination maps to ERROR. The arithmetic operators
+# (+ - * /) and the comparisons share the same Int-operands domain and differ
+# only in their result type.
+_ARITH_RESULT = {(lt, rt): (_INT if lt is _INT and rt is _INT else _ERR)
+                 for lt in PrimitiveType for rt in PrimitiveType}
+_COMPARE_RESULT = {pair: (_BOOL if result is _INT else _ERR)
+                   for pair, result in _ARITH_RESULT.items()}
+_NEG_RESULT = {('-', _INT): _INT, ('!', _BOOL): _BOOL}
+
+# ERROR-absorbing default: any node that never has a type recorded reads back
+# as ERROR through this class-level attribute, so the listeners' error
+# branches don't need to write anything - only success branches assign.
+ParserRuleContext._nimble_type = _ERR
+
+# Statement kinds the reachability analysis cares about, keyed by context class.
+# A single dict lookup on stmt.__class__ replaces the repeated
+# type(stmt) == NimbleParser.XContext comparisons in the walkers below.
+_STMT_KIND = {
+    NimbleParser.IfContext: 'if',
+    NimbleParser.WhileContext: 'while',
+    NimbleParser.ReturnContext: 'return',
+}
+
+
+class NodeTypes:
+    """
+    Mapping-style store for the inferred types of parse tree nodes. Instead of
+    a dict keyed by node objects (hash + probe on every access), the type is
+    written straight onto the node as its `_nimble_type` attribute - this class
+    just keeps the familiar `types[node]` interface and remembers which nodes
+    were typed (in assignment order) so clients like the test helpers can still
+    iterate over all recorded (node, type) entries.
+    """
+
+    def __init__(self):
+        self._typed_nodes = []
+        self._seen = set()
+
+    def __setitem__(self, node, node_type):
+        if node not in self._seen:
+            self._seen.add(node)
+            self._typed_nodes.append(node)
+        node._nimble_type = node_type
+
+    def __getitem__(self, node):
+        return node._nimble_type
+
+    def __len__(self):
+        return len(self._typed_nodes)
+
+    def items(self):
+        return [(node, node._nimble_type) for node in self._typed_nodes]
+
 
 # --- Defining Classes that contain exit and enter functions ---
 
 
 class DefineScopesAndSymbols(NimbleListener):
 
+    # Slot descriptors make each self.<attr> access a fixed-offset load instead
+    # of an instance-dict lookup.
+    __slots__ = ('error_log', 'current_scope', 'type_of')
+
     def __init__(self, error_log: ErrorLog, global_scope: Scope, types: dict):
         self.error_log = error_log
         self.current_scope = global_scope
         self.type_of = types
 
     def enterMain(self, ctx: NimbleParser.MainContext):
-        self.current_scope = self.current_scope.create_child_scope('$main', PrimitiveType.Void)
+        self.current_scope = self.current_scope.create_child_scope('$main', _VOID)
+        # Stash the scope on the node so the inference phase can enter it with
+        # a plain attribute load instead of a name lookup.
+        ctx._scope = self.current_scope
 
     def exitMain(self, ctx: NimbleParser.MainContext):
         self.current_scope = self.current_scope.enclosing_scope
@@ -69,29 +154,30 @@ class DefineScopesAndSymbols(NimbleListener):
         # ! Stay in global scope, just create the function "symbol" and do nothing else
 
         # Get function name
-        func_name = ctx.ID().getText();
+        func_name = ctx.ID().getText()
 
         # EXTRACT types of parameters from each paramDef token
         # (Have to do this since we haven't created parameter symbols in function scope yet)
-        param_types = [PrimitiveType[this_param.TYPE().getText()] for this_param in ctx.parameterDef()];
+        param_types = [_PRIM[this_param.TYPE().getText()] for this_param in ctx.parameterDef()]
 
         # Get return type of function (default to void).
-        ret_type = PrimitiveType.Void;
-        if ctx.TYPE() is not None:
-            ret_type = PrimitiveType[ctx.TYPE().getText()];
+        type_node = ctx.TYPE()
+        ret_type = _VOID
+        if type_node is not None:
+            ret_type = _PRIM[type_node.getText()]
 
         # Create function type symbol in global scope.
-        this_funcDef = FunctionType(param_types, ret_type);
-        self.current_scope.define(func_name, this_funcDef)
+        self.current_scope.define(func_name, FunctionType(param_types, ret_type))
 
-        # Create the function's scope in the global scope
-        self.current_scope.create_child_scope(ctx.ID().getText(), ret_type)
+        # Create the function's scope in the global scope, stashing it on the
+        # node for the inference phase (see enterMain).
+        ctx._scope = self.current_scope.create_child_scope(func_name, ret_type)
 
 
 class InferTypesAndCheckConstraints(NimbleListener):
     """
     The type of each expression parse tree node is calculated and stored in the
-    `self.type_of` dictionary, where the key is the node object, and the value is
+    `self.type_of` `NodeTypes` store, where the key is the node object, and the value is
     an instance of `symboltable.PrimitiveType`.
 
     The types of declared variables are stored in `self.variables`, which is a dictionary
@@ -101,205 +187,229 @@ class InferTypesAndCheckConstraints(NimbleListener):
     type mismatches, etc., are logged in the `error_log`
     """
 
+    __slots__ = ('error_log', 'current_scope', 'type_of', '_totalblocked_cache',
+                 '_resolve_cache')
+
     def __init__(self, error_log: ErrorLog, global_scope: Scope, types: dict):
         self.error_log = error_log
         self.current_scope = global_scope
         self.type_of = types
 
+        # Memoizes check_if_totalblocked results per if-statement node (keyed by id)
+        # so nested if statements are only analyzed once per walk.
+        self._totalblocked_cache = {}
+
+        # Memoizes Scope.resolve hits keyed by (id(scope), name), so repeated
+        # references to the same name don't re-walk the scope chain. Cleared on
+        # scope changes; entries are dropped whenever a name is (re)defined.
+        self._resolve_cache = {}
+
+    def resolve_cached(self, name):
+        """ Resolves <name> in the current scope, memoizing successful lookups
+        in self._resolve_cache. Failed lookups are not cached - the name may
+        legitimately be defined later in the walk. """
+        key = (id(self.current_scope), name)
+        symbol = self._resolve_cache.get(key)
+        if symbol is None:
+            symbol = self.current_scope.resolve(name)
+            if symbol is not None:
+                self._resolve_cache[key] = symbol
+        return symbol
+
     def enterFuncDef(self, ctx: NimbleParser.FuncDefContext):
 
-        # Switch scope to that of the function
-        self.current_scope = self.current_scope.child_scope_named(ctx.ID().getText())
+        # Switch scope to that of the function, stashed on the node by
+        # DefineScopesAndSymbols - no string-keyed child_scope_named lookup.
+        self.current_scope = ctx._scope
+        self._resolve_cache.clear()
         # everything else gets handled at the lower levels.
 
     def exitFuncDef(self, ctx: NimbleParser.FuncDefContext):
 
         # Return to global scope
         self.current_scope = self.current_scope.enclosing_scope
+        self._resolve_cache.clear()
         # Everything inside gets handled at lower levels.
 
-    def sub_var_dec(self, ctx):
-
-        # Extracting variable type declared, its primitive type, and the ID declared
-        var_text = ctx.TYPE().getText()
-        var_primtype = PrimitiveType[var_text]
-        this_ID = ctx.ID().getText()
-
-        # First thing to check is if we're declaring a duplicated variable name. Set ERROR if so and stop function.
-        if self.current_scope.resolve_locally(this_ID) is not None:
-            self.current_scope.define(this_ID, PrimitiveType.ERROR, False)
-            self.error_log.add(ctx, Category.DUPLICATE_NAME, f"Previously declared variable already has name"
-                                                             f"[{this_ID}]. No duplicates are allowed.")
-            error = True
-        else:
-            error = False
-
-        return var_text, var_primtype, this_ID, error
-
     def exitParameterDef(self, ctx: NimbleParser.ParameterDefContext):
         # Create parameter symbol in the current scope (function scope)
         # similar to var dec
-        var_text, var_primtype, this_ID, error = self.sub_var_dec(ctx)
+        this_ID = ctx.ID().getText()
+
+        # Declaring a name (re)binds it in the current scope, so any cached
+        # resolution of it is now stale.
+        self._resolve_cache.pop((id(self.current_scope), this_ID), None)
 
-        # create the symbol with the inputted type
-        if not error:
-            self.current_scope.define(this_ID, var_primtype, True)
+        # A duplicated parameter name gets the ERROR type; otherwise create
+        # the symbol with the declared type.
+        if self.current_scope.resolve_locally(this_ID) is not None:
+            self.current_scope.define(this_ID, _ERR, False)
+            self.error_log.add(ctx, Category.DUPLICATE_NAME, "Previously declared variable already has name"
+                                                             "[%s]. No duplicates are allowed.", this_ID)
+        else:
+            self.current_scope.define(this_ID, _PRIM[ctx.TYPE().getText()], True)
 
     def exitReturn(self, ctx: NimbleParser.ReturnContext):
 
         # must match the function definition's type else create an error in the error log
         # in the main only a bare return can be used
 
+        # Bind the expression child and its inferred type once - ctx.expr() walks
+        # the child list on each call. Types are read straight off the node's
+        # _nimble_type attribute (see NodeTypes) - no mapping indirection.
         expr = ctx.expr()
+        expr_type = expr._nimble_type if expr is not None else None
 
         # checking if type matches function
-        # (The type of the main function is PrimitiveType.Void)
+        # (The type of the main function is _VOID)
         return_type = self.current_scope.return_type
-        if return_type is not PrimitiveType.Void:
-            if ctx.expr() is None:
+        if return_type is not _VOID:
+            if expr is None:
                 self.error_log.add(ctx, Category.INVALID_RETURN,
                                    f"ERROR: Function of type void cannot return something.")
-            elif return_type != self.type_of[ctx.expr()]:
+            elif return_type is not expr_type:
                 self.error_log.add(ctx, Category.INVALID_RETURN,
-                                   f"ERROR: Type returned ({self.type_of[ctx.expr()]}) does not match function "
-                                   f"declaration type ({return_type}).")
+                                   "ERROR: Type returned (%s) does not match function "
+                                   "declaration type (%s).", expr_type.name, return_type.name)
 
         else:
             if expr is not None:
                 self.error_log.add(ctx, Category.INVALID_RETURN,
-                                   f"ERROR: Function declaration has return type ({PrimitiveType.Void}).")
+                                   "ERROR: Function declaration has return type (%s).", _VOID.name)
 
     def exitFuncCall(self, ctx: NimbleParser.FuncCallContext):
 
         # ensure that the function exists within the global scope otherwise it's an error
         # ensure that argument types match the function's parameter types otherwise it's an error
 
-        # Extracting tokens
-        func_ID = ctx.ID().getText();
-        func_args = [this_expr for this_expr in ctx.expr()];
+        # Extracting tokens. ctx.expr() already returns the argument list - no
+        # need to copy it through a comprehension.
+        func_ID = ctx.ID().getText()
+        func_args = ctx.expr()
 
         # First, check if a function with func_ID name exists. If none exists, set error accordingly and stop function
-        func_symbol = self.current_scope.resolve(func_ID);
+        func_symbol = self.resolve_cached(func_ID)
         if func_symbol is None:
-            self.type_of[ctx] = PrimitiveType.ERROR;
-            self.error_log.add(ctx, Category.INVALID_CALL, f"ERROR: A function with name {func_ID} does not exist. "
-                                                           f"Check spelling or number of inputted arguments.");
-            return;
+            self.error_log.add(ctx, Category.INVALID_CALL, "ERROR: A function with name %s does not exist. "
+                                                           "Check spelling or number of inputted arguments.", func_ID)
+            return
+
+        # A call with the wrong number of arguments can never match - check up
+        # front, since zip below would silently truncate the comparison.
+        param_types = func_symbol.type.parameter_types
+        if len(func_args) != len(param_types):
+            self.error_log.add(ctx, Category.INVALID_CALL,
+                               "ERROR: Function %s takes %d argument(s), "
+                               "but %d were given.", func_ID, len(param_types), len(func_args))
+            return
+
+        # Fast path for the common well-typed call: one C-level list comparison
+        # against the parameter types, no per-argument Python branching.
+        arg_types = [this_arg._nimble_type for this_arg in func_args]
+        if arg_types == param_types:
+            self.type_of[ctx] = func_symbol.type.return_type
+            return
 
-        # If function exists, check argument types if matching with parameter types
-        error_found = False;
-        error_args = [];
-        error_params = [];
-        for this_arg, this_param_type in zip(func_args, func_symbol.type.parameter_types):
+        # Mismatch somewhere - walk the arguments to build the detailed message.
+        # The mismatch accumulators are only allocated once a first mismatch is found.
+        # Arguments that are already ERROR were reported upstream: they still
+        # poison the call's type, but produce no mismatch message of their own.
+        error_args = None
+        error_params = None
+        for this_arg, this_arg_type, this_param_type in zip(func_args, arg_types, param_types):
+
+            if this_arg_type is _ERR:
+                continue
 
             # Check if a given argument does not match types with its respective parameter.
             # Find all mismatches and update error log accordingly.
-            if self.type_of[this_arg] != this_param_type:
-                error_args.append(f"{this_arg.getText()}:{self.type_of[this_arg]}");
-                error_params.append(f"{this_param_type}");
-                error_found = True;
-
-        # If we found an error, set funcCall expression's type to ERROR.
-        # Otherwise, set to return type of function
-        if error_found:
-            error_msg = f"ERROR: Argument(s) [{', '.join(error_args)}] do not " \
-                        f"match respective expected function parameters types [{', '.join(error_params)}]."
-            self.error_log.add(ctx, Category.INVALID_CALL, error_msg)
-            self.type_of[ctx] = PrimitiveType.ERROR;
-        else:
-            self.type_of[ctx] = func_symbol.type.return_type;
+            if this_arg_type is not this_param_type:
+                if error_args is None:
+                    error_args = []
+                    error_params = []
+                error_args.append(f"{this_arg.getText()}:{this_arg_type.name}")
+                error_params.append(this_param_type.name)
+
+        # Any deviation from the parameter list - a reported mismatch or an
+        # already-ERROR argument - leaves the call on its ERROR default.
+        if error_args is not None:
+            self.error_log.add(ctx, Category.INVALID_CALL,
+                               lambda error_args=error_args, error_params=error_params:
+                               f"ERROR: Argument(s) [{', '.join(error_args)}] do not "
+                               f"match respective expected function parameters types [{', '.join(error_params)}].")
 
     def exitFuncCallExpr(self, ctx: NimbleParser.FuncCallExprContext):
         # Need to assign it the type returned by the function
         # Checks if the type void
-        _type = self.type_of[ctx.funcCall()]
-        if _type == PrimitiveType.Void:
+        _type = ctx.funcCall()._nimble_type
+        if _type is _VOID:
             self.error_log.add(ctx, Category.INVALID_CALL, "A void type function can not act as an expression.")
-            self.type_of[ctx] = PrimitiveType.ERROR
             return
         self.type_of[ctx] = _type
 
-    def exitFuncCallStmt(self, ctx: NimbleParser.FuncCallStmtContext):
-        # Don't need to do anything here
-        pass
+    # funcCallStmt and script need no semantic analysis or constraint checking;
+    # the inherited no-ops from NimbleListener cover them.
 
     # --------------------------------------------------------
     # Program structure
     # --------------------------------------------------------
 
-    def exitScript(self, ctx: NimbleParser.ScriptContext):
-        # Doesn't need any semantic analysis or constraint checking.
-        pass
-
     def enterMain(self, ctx: NimbleParser.MainContext):
-        # Change current_scope field from $global -> $main
-        self.current_scope = self.current_scope.child_scope_named('$main')
+        # Change current_scope field from $global -> $main, using the scope
+        # stashed on the node by DefineScopesAndSymbols.
+        self.current_scope = ctx._scope
+        self._resolve_cache.clear()
 
     def exitMain(self, ctx: NimbleParser.MainContext):
         # Change current_scope field from $main -> $global
         self.current_scope = self.current_scope.enclosing_scope
+        self._resolve_cache.clear()
 
-    def exitBody(self, ctx: NimbleParser.BodyContext):
-        pass;
-
-    def exitVarBlock(self, ctx: NimbleParser.VarBlockContext):
-        # Doesn't need any semantic analysis or constraint checking.
-        pass
+    # body and varBlock likewise need nothing beyond the inherited no-ops.
 
     # Ohhhh yess it's "recursion time". Probably not the most elegant solution, but it's a solution :).
     def exitBlock(self, ctx: NimbleParser.BlockContext):
 
-        # Search for a return statement in a given block node.
-        # If one found, set all statements (if there are any) after the
-        # return statement to unreachable.
-        return_found = False;
+        # Single pass over the block's statements: find the first "terminator"
+        # (a return statement or a totally blocked if statement), and mark every
+        # statement after it as unreachable as we go.
+        first_terminator_found = False;
+        marked = set();
         for this_statement in ctx.statement():
 
-            if not return_found:
-
-                # Check if current statement was a return
-                if type(this_statement) == NimbleParser.ReturnContext:
-                    return_found = True;
-
-                # Check if current statement was a totally blocked if statement
-                if type(this_statement) == NimbleParser.IfContext:
-                    if self.check_if_totalblocked(this_statement):
-                        return_found = True;
+            if not first_terminator_found:
+                first_terminator_found = self.is_terminator(this_statement);
 
-            # If return found, set all following statements to unreachable
+            # If terminator found, set all following statements to unreachable
             else:
+                self.mark_unreachable(this_statement, marked);
+
+        # If current block node is a function's body, check for missing return statements:
+        # a non-void function's block must contain a return or a totally blocked
+        # if-statement - exactly the terminator search done above. The current scope's
+        # return_type already tells us whether we're in a non-void function (main's
+        # scope is Void), so one parent hop to the body node suffices - no climbing
+        # to the funcDef or re-scanning its children for TYPE().
+        if (self.current_scope.return_type is not _VOID
+                and ctx.parentCtx.__class__ is NimbleParser.BodyContext
+                and not first_terminator_found):
+            self.error_log.add(ctx, Category.MISSING_RETURN,
+                               lambda ctx=ctx: f"Not all routes in block node "
+                                               f"{ctx.getText()} have a return statement.");
+
+    def is_terminator(self, this_statement) -> bool:
+        """ Checks if the passed in statement always ends execution of its block:
+        either a return statement, or a totally blocked if statement (memoized in
+        self._totalblocked_cache by check_if_totalblocked). """
+
+        kind = _STMT_KIND.get(this_statement.__class__);
+        if kind == 'return':
+            return True;
+        elif kind == 'if':
+            return self.check_if_totalblocked(this_statement);
+        return False;
 
-                self.error_log.add(this_statement, Category.UNREACHABLE_STATEMENT,
-                                   f"Statement [{this_statement.getText()}] is unreachable.");
-
-                # If we encounter an if or while statement, descend into
-                # their block nodes and set all their statements to unreachable.
-                self.check_if_while_encountered(this_statement);
-
-        # If current block node is a child of a function definition, check for missing return statements:
-        # conduct second pass through all statements if there is a return or a totally blocked if-statement.
-        # If so, all routes have a return statement. Otherwise, we have a missing return.
-        if type(ctx.parentCtx.parentCtx) == NimbleParser.FuncDefContext:
-
-            # Only check if function is not a void type.
-            funcCtx = ctx.parentCtx.parentCtx;
-            if funcCtx.TYPE() is not None:
-
-                fully_blocked = False;
-                for this_statement in ctx.statement():
-
-                    if type(this_statement) == NimbleParser.IfContext:
-                        if self.check_if_totalblocked(this_statement):
-                            fully_blocked = True;
-
-                    elif type(this_statement) == NimbleParser.ReturnContext:
-                        fully_blocked = True;
-
-                if not fully_blocked:
-                    self.error_log.add(ctx, Category.MISSING_RETURN, f"Not all routes in block node "
-                                                                     f"{ctx.getText()} have a return statement.");
-
-    def check_if_totalblocked(self, this_if_statement):
+    def check_if_totalblocked(self, this_if_statement: NimbleParser.IfContext) -> bool:
         """ Checks if passed in this_if_statement is "totally blocked", meaning there
         is a return statement in all possible routes of the statement.
 
@@ -307,126 +417,146 @@ class InferTypesAndCheckConstraints(NimbleListener):
         statement in the block node is basically unreachable. In other words,
         a totally blocked if statement serves as a return statement.
 
-        Returns: True if totally blocked. False otherwise. """
-
-        # Booleans to track if return statement or totally blocked if found
-        # in the if and else block of the statement. Default to False.
-        if_blocked = False;
-        else_blocked = False;
-
-        # Check if an else block exists, if not, can't be totally blocked - return False.
-        if this_if_statement.block(1) is None:
-            return False;
+        Results are memoized per node in self._totalblocked_cache, so if statements
+        revisited from an enclosing block are not re-analyzed. The traversal is an
+        explicit post-order work-stack rather than recursion, so deeply nested
+        if/else chains can't blow Python's call stack.
 
-        # Look through if-block
-        for this_statement in this_if_statement.block(0).statement():
-
-            # If we encounter another if statement, check if it's totally blocked.
-            # If so, is basically a return statement.
-            if type(this_statement) == NimbleParser.IfContext:
-                if self.check_if_totalblocked(this_statement):
-                    if_blocked = True;
-                    break;
-
-            # If we encounter a return statement at any point, if-block route is totally blocked
-            elif type(this_statement) == NimbleParser.ReturnContext:
-                if_blocked = True;
-                break;
-
-        # If the if-block is not totally blocked, no point in checking else-block for blockage.
-        if if_blocked:
-
-            # Look through else-block
-            for this_statement in this_if_statement.block(1).statement():
+        Returns: True if totally blocked. False otherwise. """
 
-                # If we encounter a fully blocked if-statement
-                # If so, is basically a return statement.
-                if type(this_statement) == NimbleParser.IfContext:
-                    if self.check_if_totalblocked(this_statement):
-                        else_blocked = True;
+        cache = self._totalblocked_cache;
+        cached = cache.get(id(this_if_statement));
+        if cached is not None:
+            return cached;
+
+        stack = [this_if_statement];
+        while stack:
+
+            this_if = stack[-1];
+            if id(this_if) in cache:
+                stack.pop();
+                continue;
+
+            # Bind both branch blocks once - ANTLR's block(i) accessor re-filters
+            # the child list on every call.
+            if_block = this_if.block(0);
+            else_block = this_if.block(1);
+
+            # If no else block exists, can't be totally blocked.
+            if else_block is None:
+                cache[id(this_if)] = False;
+                stack.pop();
+                continue;
+
+            # Each branch is blocked if it contains a return statement or a totally
+            # blocked nested if. A nested if whose result isn't cached yet is
+            # deferred: push it and re-examine this node once it has been computed.
+            blocked = True;
+            deferred = None;
+            for this_block in (if_block, else_block):
+
+                branch_blocked = False;
+                for this_statement in this_block.statement():
+
+                    kind = _STMT_KIND.get(this_statement.__class__);
+                    if kind == 'return':
+                        branch_blocked = True;
                         break;
-
-                # If we encounter a return statement at any point, else-block route is totally blocked
-                elif type(this_statement) == NimbleParser.ReturnContext:
-                    else_blocked = True;
+                    elif kind == 'if':
+                        nested_result = cache.get(id(this_statement));
+                        if nested_result is None:
+                            deferred = this_statement;
+                            break;
+                        elif nested_result:
+                            branch_blocked = True;
+                            break;
+
+                if deferred is not None:
                     break;
 
-        # Return true if all routes of if statement are blocked.
-        if if_blocked and else_blocked:
-            return True;
-        else:
-            return False;
-
-    def check_if_while_encountered(self, this_statement):
-
-        # Wrapper function to check if we encountered an if or while statement.
-        # Descend into their blocks and set all their statements to unreachable.
-        if type(this_statement) == NimbleParser.IfContext:
-            self.set_if_unreachable(this_statement);
-        elif type(this_statement) == NimbleParser.WhileContext:
-            self.set_while_unreachable(this_statement);
-
-    def set_while_unreachable(self, this_while):
-
-        # Iterate through all statements in the block node...
-        for this_statement in this_while.block().statement():
-            # Set each as unreachable
-            self.error_log.add(this_statement, Category.UNREACHABLE_STATEMENT,
-                               f"Statement [{this_statement.getText()}] is unreachable.");
-
-            # If we encounter another if or while statement, descend into
-            # their block nodes and set all their statements to unreachable.
-            self.check_if_while_encountered(this_statement);
-
-    def set_if_unreachable(self, this_if):
-
-        # Iterate through all statements of all its block nodes...
-        for this_block in this_if.block():
-            for this_statement in this_block.statement():
-                # Set each as unreachable
-                self.error_log.add(this_statement, Category.UNREACHABLE_STATEMENT,
-                                   f"Statement [{this_statement.getText()}] is unreachable.");
-
-                # If we encounter another if or while statement, descend into
-                # their block nodes and set all their statements to unreachable.
-                self.check_if_while_encountered(this_statement);
-
-    def set_block_unreachable(self, this_node):
-
-        for this_statement in this_node.block().statement():
-
-            # Set each statement to unreachable.
-            # If encounter another block, descend tree with recursion
-            self.error_log.add(this_statement, Category.UNREACHABLE_STATEMENT,
-                               f"Statement [{this_statement.getText()}] is unreachable.");
+                # If this branch is not totally blocked, no point in checking the other.
+                if not branch_blocked:
+                    blocked = False;
+                    break;
 
-            if type(this_statement) == NimbleParser.BlockContext:
-                self.set_block_unreachable(this_statement);
+            if deferred is not None:
+                stack.append(deferred);
+            else:
+                cache[id(this_if)] = blocked;
+                stack.pop();
+
+        return cache[id(this_if_statement)];
+
+    def mark_unreachable(self, this_statement, marked: set) -> None:
+
+        # Set the statement (and everything inside its if/while blocks, if any)
+        # as unreachable, using an explicit work-stack instead of recursion.
+        # Nodes already marked during this block's walk (keyed by id in the
+        # <marked> set) are skipped.
+        stack = deque([this_statement]);
+        while stack:
+
+            statement = stack.pop();
+            if id(statement) in marked:
+                continue;
+            marked.add(id(statement));
+
+            # Deferred message: getText() assembles the whole subtree's source, so
+            # don't pay for it unless the entry is actually displayed.
+            self.error_log.add(statement, Category.UNREACHABLE_STATEMENT,
+                               lambda statement=statement:
+                               f"Statement [{statement.getText()}] is unreachable.");
+
+            # If the statement is an if or while statement, queue up their block
+            # nodes' statements to be set unreachable too.
+            kind = _STMT_KIND.get(statement.__class__);
+            if kind == 'if':
+                for this_block in statement.block():
+                    stack.extend(this_block.statement());
+            elif kind == 'while':
+                stack.extend(statement.block().statement());
 
     # --------------------------------------------------------
     # Variable declarations
     # --------------------------------------------------------
 
     def exitVarDec(self, ctx: NimbleParser.VarDecContext):
-        var_text, var_primtype, this_ID, error = self.sub_var_dec(ctx)
 
-        # If no duplicate name, and if there was an assignment,
-        # check if does not violate type constraint
-        if ctx.expr() is not None:
+        # Extracting variable type declared, its primitive type, and the ID declared
+        var_text = ctx.TYPE().getText()
+        var_primtype = _PRIM[var_text]
+        this_ID = ctx.ID().getText()
+
+        # Declaring a name (re)binds it in the current scope, so any cached
+        # resolution of it is now stale.
+        self._resolve_cache.pop((id(self.current_scope), this_ID), None)
+
+        # A duplicated variable name gets the ERROR type once; the assignment
+        # check below still runs so a bad initializer is also reported.
+        duplicate = self.current_scope.resolve_locally(this_ID) is not None
+        if duplicate:
+            self.current_scope.define(this_ID, _ERR, False)
+            self.error_log.add(ctx, Category.DUPLICATE_NAME, "Previously declared variable already has name"
+                                                             "[%s]. No duplicates are allowed.", this_ID)
+
+        # If there was an assignment, check if does not violate type constraint
+        expr = ctx.expr()
+        if expr is not None:
 
             # Extract value of expression put for assignment
-            expr_type = self.type_of[ctx.expr()]
+            expr_type = expr._nimble_type
 
             # Check if they match. If not, then there was a constraint violation
-            if expr_type != var_primtype:
-                self.current_scope.define(this_ID, PrimitiveType.ERROR, False)
-                self.type_of[ctx] = PrimitiveType.ERROR
+            # (the ERROR symbol was already defined on the duplicate path).
+            if expr_type is not var_primtype:
+                if not duplicate:
+                    self.current_scope.define(this_ID, _ERR, False)
                 self.error_log.add(ctx, Category.ASSIGN_TO_WRONG_TYPE,
-                                   f"Can't assign {str(expr_type)} to variable of type {var_text}")
+                                   "Can't assign %s to variable of type %s", expr_type.name, var_text)
                 return
 
         # If all input conditions met, create the symbol with the inuptted typeset the variable type accordingly
-        if not error:
+        if not duplicate:
             self.current_scope.define(this_ID, var_primtype, False)
 
     # --------------------------------------------------------
@@ -439,118 +569,171 @@ class InferTypesAndCheckConstraints(NimbleListener):
         # Otherwise, gets type ERROR
 
         this_ID = ctx.ID().getText()
-        expr_type = self.type_of[ctx.expr()]
-        symbol = self.current_scope.resolve(this_ID)
+        expr_type = ctx.expr()._nimble_type
+        symbol = self.resolve_cached(this_ID)
 
         # Checking if variable under ID has been declared. If not, record the error
         if symbol is None:
-            self.error_log.add(ctx, Category.UNDEFINED_NAME, f"Can't assign value to undefined variable [{this_ID}]")
+            self.error_log.add(ctx, Category.UNDEFINED_NAME, "Can't assign value to undefined variable [%s]", this_ID)
             return
 
         # Otherwise, check if expr_type does not match variable type. If not, record the error
-        if symbol.type != expr_type:
-            self.error_log.add(ctx, Category.ASSIGN_TO_WRONG_TYPE, f"Can't assign value of type {expr_type} to variable"
-                                                                   f" [{this_ID}] of type {symbol.type}.")
+        if symbol.type is not expr_type:
+            self.error_log.add(ctx, Category.ASSIGN_TO_WRONG_TYPE,
+                               "Can't assign value of type %s to variable"
+                               " [%s] of type %s.", expr_type.name, this_ID, symbol.type)
 
     def exitWhile(self, ctx: NimbleParser.WhileContext):
-        if self.type_of[ctx.expr()] != PrimitiveType.Bool:
-            self.error_log.add(ctx, Category.CONDITION_NOT_BOOL, f"Type {self.type_of[ctx.expr()]} is not of type bool")
+        cond_type = ctx.expr()._nimble_type
+        if cond_type is not _BOOL:
+            self.error_log.add(ctx, Category.CONDITION_NOT_BOOL,
+                               "Type %s is not of type bool", cond_type.name)
 
     def exitIf(self, ctx: NimbleParser.IfContext):
         # Simply check if the expr child is of type boolean. If not, record error
-        if self.type_of[ctx.expr()] != PrimitiveType.Bool:
-            self.error_log.add(ctx, Category.CONDITION_NOT_BOOL, f"if-statement condition [{ctx.expr().getText()}] "
-                                                                 f"can only be of type {PrimitiveType.Bool}, not "
-                                                                 f"{self.type_of[ctx.expr()]}.")
+        cond = ctx.expr()
+        cond_type = cond._nimble_type
+        if cond_type is not _BOOL:
+            self.error_log.add(ctx, Category.CONDITION_NOT_BOOL,
+                               lambda cond=cond, cond_type=cond_type:
+                               f"if-statement condition [{cond.getText()}] "
+                               f"can only be of type {_BOOL.name}, not "
+                               f"{cond_type.name}.")
 
     def exitPrint(self, ctx: NimbleParser.PrintContext):
         # If expression to print is of type ERROR, record accordingly in error log.
-        if self.type_of[ctx.expr()] == PrimitiveType.ERROR:
-            self.error_log.add(ctx, Category.UNPRINTABLE_EXPRESSION, f"Can't print expression of type "
-                                                                     f"{PrimitiveType.ERROR}.")
+        if ctx.expr()._nimble_type is _ERR:
+            self.error_log.add(ctx, Category.UNPRINTABLE_EXPRESSION, "Can't print expression of type "
+                                                                     "%s.", _ERR.name)
 
     # --------------------------------------------------------
     # Expressions
     # --------------------------------------------------------
 
     def exitIntLiteral(self, ctx: NimbleParser.IntLiteralContext):
-        self.type_of[ctx] = PrimitiveType.Int
+        self.type_of[ctx] = _INT
 
     def exitNeg(self, ctx: NimbleParser.NegContext):
-        # Are conditions met for an integer negation?
-        if ctx.op.text == '-' and self.type_of[ctx.expr()] == PrimitiveType.Int:
-            self.type_of[ctx] = PrimitiveType.Int
-
-        # Are conditions met for a boolean negation?
-        elif ctx.op.text == '!' and self.type_of[ctx.expr()] == PrimitiveType.Bool:
-            self.type_of[ctx] = PrimitiveType.Bool
+        # An ERROR operand was already reported upstream - propagate silently
+        # instead of cascading a second error.
+        operand_type = ctx.expr()._nimble_type
+        if operand_type is _ERR:
+            return
 
-        # If none, then error had occurred.
-        else:
-            self.type_of[ctx] = PrimitiveType.ERROR
+        # One lookup in the (operator, operand type) table decides the result:
+        # - on Int, ! on Bool, anything else leaves the ERROR default.
+        op = ctx.op.text
+        result = _NEG_RESULT.get((op, operand_type), _ERR)
+        if result is _ERR:
             self.error_log.add(ctx, Category.INVALID_NEGATION,
-                               f"Can't apply {ctx.op.text} to [{self.type_of[ctx].name}]")
+                               "Can't apply %s to [%s]", op, _ERR.name)
+        else:
+            self.type_of[ctx] = result
 
     def exitParens(self, ctx: NimbleParser.ParensContext):
-        self.type_of[ctx] = self.type_of[ctx.expr()]
-        if self.type_of[ctx.expr()] == PrimitiveType.ERROR:
-            self.error_log.add(ctx, Category.INVALID_BINARY_OP, f"Parentheses contain expression of "
-                                                                f"type {PrimitiveType.ERROR}.")
+        # Parens simply take the inner expression's type. An ERROR inside was
+        # already reported, so it propagates through the default without a
+        # cascade entry.
+        inner_type = ctx.expr()._nimble_type
+        if inner_type is not _ERR:
+            self.type_of[ctx] = inner_type
+
+    def binop_int_operands(self, ctx, result_table) -> bool:
+        """ Shared type check for the binary operators over integer operands
+        (mulDiv, addSub, compare): ctx's type is a single lookup of the operand
+        type pair in <result_table> (see _ARITH_RESULT/_COMPARE_RESULT). An
+        operand that is already ERROR had its real problem reported upstream,
+        so it propagates silently. Returns False only when the caller should
+        log its operator-specific INVALID_BINARY_OP message. """
+        left = ctx.expr(0)._nimble_type
+        right = ctx.expr(1)._nimble_type
+        result = result_table[(left, right)]
+        if result is not _ERR:
+            self.type_of[ctx] = result
+            return True
+        if left is _ERR or right is _ERR:
+            return True
+        return False
 
     def exitMulDiv(self, ctx: NimbleParser.MulDivContext):
-        left = self.type_of[ctx.expr(0)]
-        right = self.type_of[ctx.expr(1)]
-        if left == PrimitiveType.Int and right == PrimitiveType.Int:
-            self.type_of[ctx] = PrimitiveType.Int
-        else:
-            self.type_of[ctx] = PrimitiveType.ERROR
+        if not self.binop_int_operands(ctx, _ARITH_RESULT):
             self.error_log.add(ctx, Category.INVALID_BINARY_OP,
-                               f"Can't multiply or divide {self.type_of[ctx.expr(0)]} "
-                               f"with/by {self.type_of[ctx.expr(1)]}")
+                               lambda ctx=ctx: f"Can't multiply or divide {ctx.expr(0)._nimble_type.name} "
+                                               f"with/by {ctx.expr(1)._nimble_type.name}")
 
     def exitAddSub(self, ctx: NimbleParser.AddSubContext):
-        # If children types correct, set type of this token to Int
-        if ((ctx.op.text == '+' or ctx.op.text == '-') and
-                self.type_of[ctx.expr(0)] == PrimitiveType.Int and
-                self.type_of[ctx.expr(1)] == PrimitiveType.Int):
-            self.type_of[ctx] = PrimitiveType.Int
-
-        # Otherwise, set as error.
-        else:
-            self.type_of[ctx] = PrimitiveType.ERROR
+        # The grammar only produces '+' or '-' as op, so the operand check is
+        # all that's needed.
+        if not self.binop_int_operands(ctx, _ARITH_RESULT):
             self.error_log.add(ctx, Category.INVALID_BINARY_OP,
-                               f"Can't apply {ctx.op.text} between non-integer type expression(s).")
+                               lambda ctx=ctx: f"Can't apply {ctx.op.text} between non-integer type expression(s).")
 
     def exitCompare(self, ctx: NimbleParser.CompareContext):
         # Both left and right expressions must be integers. Results in a boolean type.
         # If these conditions are not met, error had occurred.
-        left = self.type_of[ctx.expr(0)]
-        right = self.type_of[ctx.expr(1)]
-        if left == PrimitiveType.Int and right == PrimitiveType.Int:
-            self.type_of[ctx] = PrimitiveType.Bool
-        else:
-            self.type_of[ctx] = PrimitiveType.ERROR
-            self.error_log.add(ctx, Category.INVALID_BINARY_OP, f"Can't compare two non-integer type expressions.")
+        if not self.binop_int_operands(ctx, _COMPARE_RESULT):
+            self.error_log.add(ctx, Category.INVALID_BINARY_OP, "Can't compare two non-integer type expressions.")
 
     def exitVariable(self, ctx: NimbleParser.VariableContext):
         # Simply check if ID is an existing var, or non-error type var or a function
         # If not, set type of ctx to be ERROR.
         this_ID = ctx.ID().getText()
-        symbol = self.current_scope.resolve(this_ID)
+        symbol = self.resolve_cached(this_ID)
 
-        if symbol is None or symbol.type == PrimitiveType.ERROR:
-            self.type_of[ctx] = PrimitiveType.ERROR
+        if symbol is None or symbol.type is _ERR:
             self.error_log.add(ctx, Category.UNDEFINED_NAME,
-                               f"Variable [{this_ID}] is undefined.")
-        elif symbol.type not in [PrimitiveType.Bool, PrimitiveType.Void, PrimitiveType.Int, PrimitiveType.String]:
-            self.type_of[ctx] = PrimitiveType.ERROR
+                               "Variable [%s] is undefined.", this_ID)
+        elif symbol.type not in (_BOOL, _VOID, _INT, _STR):
             self.error_log.add(ctx, Category.FUNCTION_USED_AS_VARIABLE,
-                               f'Function [{this_ID}] is being used as a variable')
+                               'Function [%s] is being used as a variable', this_ID)
         else:
             self.type_of[ctx] = symbol.type
 
     def exitStringLiteral(self, ctx: NimbleParser.StringLiteralContext):
-        self.type_of[ctx] = PrimitiveType.String
+        self.type_of[ctx] = _STR
 
     def exitBoolLiteral(self, ctx: NimbleParser.BoolLiteralContext):
-        self.type_of[ctx] = PrimitiveType.Bool
+        self.type_of[ctx] = _BOOL
+
+
+class CombinedSemanticsListener(InferTypesAndCheckConstraints):
+    """
+    Runs both phases of the semantic analysis in a single tree walk. Function
+    symbols must all exist before any body is visited - a call may legally
+    refer to a function defined later in the script (including mutual
+    recursion) - so enterScript pre-scans just the funcDef headers to define
+    every FunctionType symbol and stash its scope, exactly what the separate
+    DefineScopesAndSymbols walk would have produced. Everything else is
+    inherited from InferTypesAndCheckConstraints: enterFuncDef enters the
+    stashed scope, and the constraint checks all fire on exits, bottom-up,
+    within the same walk.
+    """
+
+    __slots__ = ()
+
+    def enterScript(self, ctx: NimbleParser.ScriptContext):
+        for func_def in ctx.funcDef():
+
+            # Get function name
+            func_name = func_def.ID().getText()
+
+            # EXTRACT types of parameters from each paramDef token
+            # (Have to do this since we haven't created parameter symbols in function scope yet)
+            param_types = [_PRIM[this_param.TYPE().getText()]
+                           for this_param in func_def.parameterDef()]
+
+            # Get return type of function (default to void).
+            type_node = func_def.TYPE()
+            ret_type = _VOID
+            if type_node is not None:
+                ret_type = _PRIM[type_node.getText()]
+
+            # Create function type symbol in global scope, and stash the
+            # function's scope on the node for the inherited enterFuncDef.
+            self.current_scope.define(func_name, FunctionType(param_types, ret_type))
+            func_def._scope = self.current_scope.create_child_scope(func_name, ret_type)
+
+    def enterMain(self, ctx: NimbleParser.MainContext):
+        # Create the $main scope and enter it in one step
+        self.current_scope = self.current_scope.create_child_scope('$main', _VOID)
+        self._resolve_cache.clear()
@@ -9,17 +9,24 @@ Version: 2023-01-02
 """
 
 from dataclasses import dataclass
-from enum import Enum, auto
+from enum import IntEnum, auto
 from typing import Sequence, Union
 
 
-class PrimitiveType(Enum):
+class PrimitiveType(IntEnum):
+    """ An IntEnum so that equality checks hit int's C-level comparison
+    rather than a Python-level Enum.__eq__. """
     Int = auto()
     Bool = auto()
     String = auto()
     Void = auto()
     ERROR = auto()
 
+    # IntEnum renders as a plain int by default; keep the member-name
+    # presentation the rest of the code and the error messages expect.
+    def __str__(self):
+        return self.name
+
     def __repr__(self):
         return self.name
 
@@ -77,7 +77,7 @@ class TypeTests(unittest.TestCase):
         in the error_log.
         """
 
-        for expression, expected_type in tc.VALID_EXPRESSIONS:
+        for expression, expected_type in zip(tc.VALID_EXPRESSIONS_SRC, tc.VALID_EXPRESSIONS_TYPE):
 
             error_log, global_scope, indexed_types = do_semantic_analysis(expression, 'expr')
 
@@ -87,11 +87,15 @@ class TypeTests(unittest.TestCase):
 
     def test_invalid_expressions(self):
         """
-        For each pair (expression source, expected error category) in INVALID_EXPRESSIONS,
-        verifies that the expression is assigned the ERROR type and that there is a error_logged
-        error of the expected category relating to the expression.
+        For each triple (expression source, expected error category, error source) in
+        INVALID_EXPRESSIONS, verifies that the expression is assigned the ERROR type and
+        that there is a error_logged error of the expected category on the error source -
+        the innermost offending sub-expression, since already-ERROR operands propagate
+        without cascading further errors.
         """
-        for expression, expected_category in tc.INVALID_EXPRESSIONS:
+        for expression, expected_category, error_source in zip(tc.INVALID_EXPRESSIONS_SRC,
+                                                               tc.INVALID_EXPRESSIONS_CATEGORY,
+                                                               tc.INVALID_EXPRESSIONS_ERROR_SRC):
 
             error_log, global_scope, indexed_types = do_semantic_analysis(expression, 'expr')
 
@@ -99,7 +103,7 @@ class TypeTests(unittest.TestCase):
                               expected_category=expected_category):
                 self.assertEqual(PrimitiveType.ERROR, indexed_types[1][expression])
 
-                self.assertTrue(error_log.includes_exactly(expected_category, 1, expression))
+                self.assertTrue(error_log.includes_exactly(expected_category, 1, error_source))
 
     def get_valid_testItems(self, code_line):
         """
@@ -162,7 +166,7 @@ class TypeTests(unittest.TestCase):
         """
 
         # Conducting valid varDec testing
-        self.valid_list_test(tc.VALID_VARDEC)
+        self.valid_list_test(zip(tc.VALID_VARDEC_SRC, tc.VALID_VARDEC_NAME, tc.VALID_VARDEC_TYPE))
 
         # Testing the invalid varDecs separately
         for var_declaration, variable, expected_category in tc.INVALID_VARDEC:
@@ -199,7 +203,7 @@ class TypeTests(unittest.TestCase):
             # Finding which line the UNDEFINED_NAME category error exists.
             # If none found, then the invalid test case itself was invalid (ironic).
             found_line = 0
-            for i in range(1, len(indexed_types) + 1):
+            for i in range(1, len(var_script.splitlines()) + 1):
                 if error_log.includes_on_line(Category.UNDEFINED_NAME, i):
                     found_line = i
                     break
@@ -376,7 +380,9 @@ class TypeTests(unittest.TestCase):
         # Though this is an expression a special test case must be made as the function declaration must exist first
         # statement is the script to run, type is the type the funcCall should be and expr is the name of the function
         # the funcCallExpr must be on the second line
-        for statement, _type, expr in tc.VALID_FUNCCALLEXPR:
+        for statement, _type, expr in zip(tc.VALID_FUNCCALLEXPR_SRC,
+                                          tc.VALID_FUNCCALLEXPR_TYPE,
+                                          tc.VALID_FUNCCALLEXPR_EXPR):
             error_log, global_scope, indexed_types = self.get_valid_testItems(statement)
             self.assertEqual(_type, indexed_types[2][expr])
 
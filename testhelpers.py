@@ -9,13 +9,25 @@ Version: 2023-02-08
 """
 
 from collections import defaultdict
+from functools import lru_cache
 
 from antlr4 import ParseTreeWalker
 from errorlog import ErrorLog
 from generic_parser import parse
 from nimble import NimbleLexer, NimbleParser
-from nimblesemantics import DefineScopesAndSymbols, InferTypesAndCheckConstraints
-from symboltable import Scope
+from nimblesemantics import CombinedSemanticsListener, DefineScopesAndSymbols, NodeTypes
+from symboltable import PrimitiveType, Scope
+
+
+@lru_cache(maxsize=None)
+def _parsed(source, start_rule_name):
+    """
+    Parse trees for the fixed test sources, memoized per (source, start rule):
+    tests that analyze the same snippet repeatedly skip re-lexing and
+    re-parsing. Re-walking a cached tree is safe - the analysis only writes
+    node attributes, which each fresh walk overwrites with the same values.
+    """
+    return parse(source, start_rule_name, NimbleLexer, NimbleParser)
 
 
 def do_semantic_analysis(source, start_rule_name, first_phase_only=False):
@@ -23,30 +35,29 @@ def do_semantic_analysis(source, start_rule_name, first_phase_only=False):
     Runs semantic analysis on the source parse tree, then indexes
     the computed node_types by line and expression to help with testing.
 
-    The semantic analysis is in two phases:
+    The semantic analysis has two phases:
 
     - `DefineScopesAndSymbols`, then
     - `InferTypesAndCheckConstraints`
 
-    See `nimblesemantics.py` for descriptions of the two phases.
+    See `nimblesemantics.py` for descriptions of the two phases. The full
+    analysis runs both in a single tree walk via `CombinedSemanticsListener`.
 
     The second phase can be switched off using the `first_phase_only` parameter,
     where you want to test just the results of the first phase.
     """
 
-    tree = parse(source, start_rule_name, NimbleLexer, NimbleParser)
+    tree = _parsed(source, start_rule_name)
     walker = ParseTreeWalker()
 
     error_log = ErrorLog()
     global_scope = Scope('$global', None, None)
-    node_types = {}
-
-    scopes_and_symbols = DefineScopesAndSymbols(error_log, global_scope, node_types)
-    walker.walk(scopes_and_symbols, tree)
+    node_types = NodeTypes()
 
-    if not first_phase_only:
-        types_and_constraints = InferTypesAndCheckConstraints(error_log, global_scope, node_types)
-        walker.walk(types_and_constraints, tree)
+    if first_phase_only:
+        walker.walk(DefineScopesAndSymbols(error_log, global_scope, node_types), tree)
+    else:
+        walker.walk(CombinedSemanticsListener(error_log, global_scope, node_types), tree)
 
     indexed_types = index(node_types)
     return error_log, global_scope, indexed_types
@@ -54,8 +65,12 @@ def do_semantic_analysis(source, start_rule_name, first_phase_only=False):
 
 def index(node_types):
     """ Creates the 2-level dictionary of the inferred types of each expression
-    in the script. Look in API documentation for example. """
-    indexed_types = defaultdict(dict)
+    in the script. Look in API documentation for example.
+
+    Ill-typed expressions are never recorded by the analysis - their nodes
+    carry the class-level ERROR default - so lookups of expressions absent
+    from the index report ERROR. """
+    indexed_types = defaultdict(lambda: defaultdict(lambda: PrimitiveType.ERROR))
     for ctx, inferred_type in node_types.items():
         line = ctx.start.line
         source = ctx.getText()